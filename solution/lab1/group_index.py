@@ -0,0 +1,225 @@
+"""
+Group Index
+
+In-memory time index over grouped sensor readings with range queries.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional
+
+
+SEGMENT_SIZE = 4096
+MAX_GROUPS = 5_000_000
+
+
+class _Segment:
+    """A contiguous, time-ordered run of groups for one device."""
+
+    __slots__ = ("device_id", "starts", "ends", "max_ends", "groups")
+
+    def __init__(self, device_id: str) -> None:
+        self.device_id = device_id
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.max_ends: List[int] = []
+        self.groups: List[Dict[str, Any]] = []
+
+    def append(self, group: Dict[str, Any]) -> None:
+        end_time = group["end_time"]
+        max_end = max(self.max_ends[-1], end_time) if self.max_ends else end_time
+        self.starts.append(group["start_time"])
+        self.ends.append(end_time)
+        self.max_ends.append(max_end)
+        self.groups.append(group)
+
+    def overlapping(self, start_time: int, end_time: int) -> List[Dict[str, Any]]:
+        """Return groups in this segment overlapping [start_time, end_time]."""
+        lo = bisect_left(self.max_ends, start_time)
+        hi = bisect_right(self.starts, end_time)
+        ends = self.ends
+        groups = self.groups
+        return [groups[i] for i in range(lo, hi) if ends[i] >= start_time]
+
+
+class GroupIndex:
+    """
+    Append-only time index over the output of group_sensor_readings.
+
+    Groups are stored per device in fixed-size segments holding parallel
+    sorted arrays of start_time/end_time, so a range lookup is a pair of
+    bisects per touched segment instead of a scan of the group list.
+    Once more than max_groups groups are held, full (sealed) segments are
+    evicted least-recently-used first; a device's open tail segment is only
+    evicted when no sealed segment is left, so the budget does not depend
+    on how many devices are indexed. Eviction drops whole segments, so
+    after an eviction as few as max_groups - segment_size + 1 groups may
+    remain; max_groups must be at least segment_size so that the segment
+    just appended to is never the one evicted.
+
+    Args:
+        segment_size: Maximum number of groups per segment
+        max_groups: Maximum number of groups retained across all devices
+
+    Raises:
+        ValueError: If segment_size is not positive or max_groups is
+            smaller than segment_size
+    """
+
+    def __init__(
+        self,
+        segment_size: int = SEGMENT_SIZE,
+        max_groups: int = MAX_GROUPS
+    ) -> None:
+        if segment_size < 1:
+            raise ValueError("segment_size must be at least 1")
+        if max_groups < segment_size:
+            raise ValueError("max_groups must be at least segment_size")
+
+        self.segment_size = segment_size
+        self.max_groups = max_groups
+        self._segments: Dict[str, List[_Segment]] = {}
+        self._segment_starts: Dict[str, List[int]] = {}
+        self._sealed: "OrderedDict[int, _Segment]" = OrderedDict()
+        self._open: "OrderedDict[int, _Segment]" = OrderedDict()
+        self._size = 0
+
+    @classmethod
+    def from_groups(cls, groups: Iterable[Dict[str, Any]], **kwargs: Any) -> "GroupIndex":
+        """Build an index from an iterable of groups."""
+        index = cls(**kwargs)
+        index.extend(groups)
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def devices(self) -> List[str]:
+        """Device ids with at least one retained segment."""
+        return list(self._segments)
+
+    def add(self, group: Dict[str, Any]) -> None:
+        """
+        Append a single group.
+
+        Groups for a given device must arrive in non-decreasing start_time
+        order, which is what group_sensor_readings produces.
+
+        Raises:
+            ValueError: If the group starts before the device's last group
+        """
+        device_id = group["device_id"]
+        segments = self._segments.get(device_id)
+
+        if segments:
+            tail = segments[-1]
+            if group["start_time"] < tail.starts[-1]:
+                raise ValueError(
+                    f"{device_id}: group start_time {group['start_time']} "
+                    f"precedes last indexed start_time {tail.starts[-1]}"
+                )
+            if len(tail.groups) >= self.segment_size:
+                tail = self._new_segment(device_id)
+        else:
+            tail = self._new_segment(device_id)
+
+        tail.append(group)
+        if len(tail.groups) == 1:
+            self._segment_starts.setdefault(device_id, []).append(group["start_time"])
+        self._size += 1
+        self._touch(tail)
+        self._evict()
+
+    def extend(self, groups: Iterable[Dict[str, Any]]) -> None:
+        """Append groups in order."""
+        for group in groups:
+            self.add(group)
+
+    def query(
+        self,
+        start_time: int,
+        end_time: int,
+        device_id: Optional[str] = None,
+        is_stable: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return groups overlapping the window [start_time, end_time].
+
+        Args:
+            start_time: Window start (inclusive)
+            end_time: Window end (inclusive)
+            device_id: Restrict to one device; all devices when None
+            is_stable: Restrict to stable/unstable groups when not None
+
+        Returns:
+            Matching groups, ordered by start_time within each device
+        """
+        if device_id is not None:
+            device_ids = [device_id] if device_id in self._segments else []
+        else:
+            device_ids = list(self._segments)
+
+        result = []
+        for dev in device_ids:
+            for segment in self._overlapping_segments(dev, start_time, end_time):
+                self._touch(segment)
+                result.extend(segment.overlapping(start_time, end_time))
+
+        if is_stable is not None:
+            result = [g for g in result if g["is_stable"] == is_stable]
+        return result
+
+    def unstable_in(
+        self,
+        start_time: int,
+        end_time: int,
+        device_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return unstable groups overlapping [start_time, end_time]."""
+        return self.query(start_time, end_time, device_id=device_id, is_stable=False)
+
+    def _overlapping_segments(
+        self,
+        device_id: str,
+        start_time: int,
+        end_time: int
+    ) -> List[_Segment]:
+        """Return a device's segments that may overlap the window."""
+        segments = self._segments[device_id]
+        hi = bisect_right(self._segment_starts[device_id], end_time)
+        return [s for s in segments[:hi] if s.max_ends[-1] >= start_time]
+
+    def _new_segment(self, device_id: str) -> _Segment:
+        """Open a new tail segment for a device, sealing the previous one."""
+        segments = self._segments.setdefault(device_id, [])
+        if segments:
+            previous = segments[-1]
+            del self._open[id(previous)]
+            self._sealed[id(previous)] = previous
+        segment = _Segment(device_id)
+        segments.append(segment)
+        self._open[id(segment)] = segment
+        return segment
+
+    def _touch(self, segment: _Segment) -> None:
+        """Mark a segment as most recently used."""
+        key = id(segment)
+        if key in self._open:
+            self._open.move_to_end(key)
+        else:
+            self._sealed.move_to_end(key)
+
+    def _evict(self) -> None:
+        """Drop least-recently-used segments until within max_groups."""
+        while self._size > self.max_groups:
+            lru = self._sealed if self._sealed else self._open
+            _, segment = lru.popitem(last=False)
+            segments = self._segments[segment.device_id]
+            segments.remove(segment)
+            self._size -= len(segment.groups)
+            if not segments:
+                del self._segments[segment.device_id]
+                self._segment_starts.pop(segment.device_id, None)
+            else:
+                self._segment_starts[segment.device_id] = [s.starts[0] for s in segments]
@@ -4,7 +4,7 @@ Sensor Reading Aggregator
 Groups consecutive sensor readings by device and determines stability.
 """
 
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 
 
 STABLE_THRESHOLD = 1.0
@@ -12,7 +12,8 @@ STABLE_THRESHOLD = 1.0
 
 def group_sensor_readings(
     readings: List[Dict[str, Any]],
-    threshold: float = STABLE_THRESHOLD
+    threshold: float = STABLE_THRESHOLD,
+    profiler: Optional[Any] = None
 ) -> List[Dict[str, Any]]:
     """
     Groups consecutive sensor readings by device and determines stability.
@@ -20,6 +21,8 @@ def group_sensor_readings(
     Args:
         readings: List of dicts with 'timestamp', 'device_id', 'value'
         threshold: Maximum difference for readings to be considered stable
+        profiler: Optional StageProfiler; when given, this call and each
+            _create_group call are recorded as stages
 
     Returns:
         List of grouped readings sorted by start_time, each containing:
@@ -29,6 +32,20 @@ def group_sensor_readings(
         - end_time: Last timestamp in group
         - is_stable: Boolean (True if max - min <= threshold)
     """
+    if profiler is not None:
+        with profiler.stage("group_sensor_readings"):
+            return _group_readings(
+                readings, threshold, profiler.wrap("_create_group", _create_group)
+            )
+    return _group_readings(readings, threshold, _create_group)
+
+
+def _group_readings(
+    readings: List[Dict[str, Any]],
+    threshold: float,
+    create_group: Callable[[str, List[Dict[str, Any]], float], Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Grouping loop shared by the plain and profiled paths."""
     if not readings:
         return []
 
@@ -41,14 +58,14 @@ def group_sensor_readings(
 
         if device_id != current_device:
             if current_group:
-                groups.append(_create_group(current_device, current_group, threshold))
+                groups.append(create_group(current_device, current_group, threshold))
             current_device = device_id
             current_group = [reading]
         else:
             current_group.append(reading)
 
     if current_group:
-        groups.append(_create_group(current_device, current_group, threshold))
+        groups.append(create_group(current_device, current_group, threshold))
 
     groups.sort(key=lambda g: g["start_time"])
     return groups
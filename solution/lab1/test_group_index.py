@@ -0,0 +1,158 @@
+"""
+Tests for Group Index
+"""
+
+import unittest
+from sensor_aggregator import group_sensor_readings
+from group_index import GroupIndex
+
+
+def _group(device_id, start_time, end_time, is_stable=True):
+    return {
+        "device_id": device_id,
+        "readings": [20.0],
+        "start_time": start_time,
+        "end_time": end_time,
+        "is_stable": is_stable
+    }
+
+
+class TestGroupIndex(unittest.TestCase):
+    """Test cases for GroupIndex."""
+
+    def setUp(self):
+        readings = [
+            {"timestamp": 1698000000, "device_id": "sensor_1", "value": 23.5},
+            {"timestamp": 1698000005, "device_id": "sensor_1", "value": 23.7},
+            {"timestamp": 1698000010, "device_id": "sensor_2", "value": 45.2},
+            {"timestamp": 1698000015, "device_id": "sensor_1", "value": 28.1},
+            {"timestamp": 1698000055, "device_id": "sensor_1", "value": 31.5},
+            {"timestamp": 1698000060, "device_id": "sensor_2", "value": 45.8},
+            {"timestamp": 1698000065, "device_id": "sensor_2", "value": 46.1},
+        ]
+        self.groups = group_sensor_readings(readings)
+
+    def test_from_groups(self):
+        """Test building an index from grouped output."""
+        index = GroupIndex.from_groups(self.groups)
+
+        self.assertEqual(len(index), 4)
+        self.assertEqual(sorted(index.devices), ["sensor_1", "sensor_2"])
+
+    def test_device_range_query(self):
+        """Test range lookup for a single device."""
+        index = GroupIndex.from_groups(self.groups)
+
+        result = index.query(1698000003, 1698000020, device_id="sensor_1")
+        self.assertEqual([g["start_time"] for g in result], [1698000000, 1698000015])
+
+        result = index.query(1698000020, 1698000050, device_id="sensor_1")
+        self.assertEqual([g["start_time"] for g in result], [1698000015])
+
+        result = index.query(1698000056, 1698000100, device_id="sensor_1")
+        self.assertEqual(result, [])
+
+    def test_window_bounds_inclusive(self):
+        """Test that windows touching a group's edges include it."""
+        index = GroupIndex.from_groups(self.groups)
+
+        result = index.query(1698000005, 1698000005, device_id="sensor_1")
+        self.assertEqual(len(result), 1)
+
+        result = index.query(1698000060, 1698000060, device_id="sensor_2")
+        self.assertEqual(len(result), 1)
+
+    def test_unknown_device(self):
+        """Test querying a device that was never indexed."""
+        index = GroupIndex.from_groups(self.groups)
+        self.assertEqual(index.query(0, 2 ** 40, device_id="sensor_9"), [])
+
+    def test_unstable_in_window(self):
+        """Test interval query for unstable groups across devices."""
+        index = GroupIndex.from_groups(self.groups)
+
+        result = index.unstable_in(1698000000, 1698000100)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]["device_id"], "sensor_1")
+        self.assertEqual(result[0]["readings"], [28.1, 31.5])
+
+        self.assertEqual(index.unstable_in(1698000000, 1698000010), [])
+
+    def test_query_spans_segments(self):
+        """Test that range queries cross segment boundaries."""
+        index = GroupIndex(segment_size=2)
+        for i in range(10):
+            index.add(_group("sensor_1", i * 10, i * 10 + 5))
+
+        result = index.query(25, 62, device_id="sensor_1")
+        self.assertEqual([g["start_time"] for g in result], [20, 30, 40, 50, 60])
+
+    def test_out_of_order_append_rejected(self):
+        """Test that appends must be time-ordered per device."""
+        index = GroupIndex()
+        index.add(_group("sensor_1", 100, 110))
+        index.add(_group("sensor_2", 50, 60))
+
+        with self.assertRaises(ValueError):
+            index.add(_group("sensor_1", 90, 95))
+
+    def test_lru_eviction(self):
+        """Test that least-recently-used segments are evicted first."""
+        index = GroupIndex(segment_size=1, max_groups=2)
+        index.add(_group("sensor_1", 0, 5))
+        index.add(_group("sensor_2", 0, 5))
+
+        index.query(0, 5, device_id="sensor_1")
+        index.add(_group("sensor_3", 10, 15))
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(sorted(index.devices), ["sensor_1", "sensor_3"])
+        self.assertEqual(index.query(0, 5, device_id="sensor_2"), [])
+
+    def test_many_devices_within_budget(self):
+        """Test that device count alone never triggers eviction."""
+        index = GroupIndex(segment_size=4, max_groups=10000)
+        for i in range(20):
+            for device in range(300):
+                index.add(_group(f"sensor_{device}", i * 10, i * 10 + 5))
+
+        self.assertEqual(len(index), 6000)
+        self.assertEqual(len(index.devices), 300)
+        self.assertEqual(len(index.query(0, 1000, device_id="sensor_299")), 20)
+
+    def test_sealed_segments_evicted_before_open(self):
+        """Test that full segments go before any device's open tail."""
+        index = GroupIndex(segment_size=2, max_groups=5)
+        for i in range(4):
+            index.add(_group("sensor_1", i * 10, i * 10 + 5))
+        index.add(_group("sensor_2", 0, 5))
+        index.add(_group("sensor_3", 0, 5))
+
+        self.assertEqual(len(index), 4)
+        self.assertEqual(sorted(index.devices), ["sensor_1", "sensor_2", "sensor_3"])
+        self.assertEqual(
+            [g["start_time"] for g in index.query(0, 100, device_id="sensor_1")],
+            [20, 30]
+        )
+
+    def test_invalid_configuration(self):
+        """Test that non-positive sizes are rejected."""
+        with self.assertRaises(ValueError):
+            GroupIndex(segment_size=0)
+        with self.assertRaises(ValueError):
+            GroupIndex(max_groups=0)
+        with self.assertRaises(ValueError):
+            GroupIndex(segment_size=4096, max_groups=10)
+
+    def test_eviction_keeps_latest_group(self):
+        """Test that whole-segment eviction never drops the group just added."""
+        index = GroupIndex(segment_size=100, max_groups=150)
+        for i in range(160):
+            index.add(_group("sensor_1", i * 10, i * 10 + 5))
+            self.assertEqual(len(index.query(i * 10, i * 10, device_id="sensor_1")), 1)
+            self.assertGreaterEqual(len(index), min(i + 1, 150 - 100 + 1))
+            self.assertLessEqual(len(index), 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,14 +7,18 @@ retry logic, and batching for high-volume scenarios.
 
 import asyncio
 import time
-from typing import AsyncGenerator, List, Dict, Any
+from concurrent.futures import Executor
+from typing import AsyncGenerator, Callable, List, Dict, Any, Optional
 from collections import deque
 
+from reorder_buffer import ReorderBuffer
+
 
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 0.5
 BATCH_SIZE = 10
 BATCH_TIMEOUT = 1.0
+MAX_IN_FLIGHT = 4
 
 
 async def sensor_stream(device_id: str, delay: float) -> AsyncGenerator[Dict[str, Any], None]:
@@ -79,53 +83,187 @@ def _print_reading(reading: Dict[str, Any]) -> None:
 async def process_sensor_streams_batched(
     streams: List[AsyncGenerator],
     batch_size: int = BATCH_SIZE,
-    batch_timeout: float = BATCH_TIMEOUT
+    batch_timeout: float = BATCH_TIMEOUT,
+    max_lateness: Optional[float] = None,
+    late_handler: Optional[Callable[[Dict[str, Any]], None]] = None,
+    max_idle: Optional[float] = None,
+    profiler: Optional[Any] = None,
+    batch_handler: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    result_handler: Optional[Callable[[Any], None]] = None,
+    executor: Optional[Executor] = None,
+    max_in_flight: int = MAX_IN_FLIGHT
 ) -> None:
     """
     Process multiple sensor streams with batching for high-volume scenarios.
 
+    By default each batch is printed on the event loop thread. A
+    batch_handler replaces printing; with an executor, completed batches are
+    handed to it while the loop keeps collecting. Use a ThreadPoolExecutor
+    for work that releases the GIL and a ProcessPoolExecutor otherwise (the
+    handler and batches must then be picklable). Results reach
+    result_handler in batch order, and at most max_in_flight batches are
+    outstanding before the loop waits on the oldest. If a handler raises,
+    the collectors are cancelled and batches already submitted to the
+    executor are run to completion, their results discarded, before the
+    error propagates.
+
     Args:
         streams: List of async generators
         batch_size: Maximum batch size before processing
         batch_timeout: Maximum time to wait before processing partial batch
+        max_lateness: When set, readings pass through a per-device
+            ReorderBuffer so each device is emitted in timestamp order
+        late_handler: Receives readings that arrive beyond max_lateness
+        max_idle: Seconds after a device's last reading before its
+            reorder-buffered readings are released without waiting for a
+            newer one; defaults to batch_timeout
+        profiler: Optional StageProfiler; when given, collector throughput,
+            queue depth and each batch flush are recorded
+        batch_handler: Called with each completed batch instead of printing
+        result_handler: Called on the loop thread with each handler result
+        executor: Executor that runs batch_handler off the event loop
+        max_in_flight: Maximum batches submitted to the executor at once
+
+    Raises:
+        ValueError: If an executor is given without a batch_handler
     """
+    if executor is not None and batch_handler is None:
+        raise ValueError("executor requires a batch_handler")
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    loop = asyncio.get_running_loop()
+    in_flight = deque()
     queue = asyncio.Queue()
+    reorder = (
+        ReorderBuffer(
+            max_lateness, late_handler,
+            max_idle if max_idle is not None else batch_timeout
+        )
+        if max_lateness is not None else None
+    )
 
     async def collector(stream: AsyncGenerator) -> None:
         """Collect readings from a stream and put in queue."""
         async for reading in stream:
             await queue.put(reading)
+            if profiler is not None:
+                profiler.count("collector.readings")
+                profiler.observe("queue.size", queue.qsize())
+
+    def deliver(result: Any) -> None:
+        if result_handler is not None:
+            result_handler(result)
+
+    async def dispatch(batch: List[Dict[str, Any]]) -> None:
+        """Process a completed batch inline or via the executor."""
+        if batch_handler is None:
+            _flush_batch(batch, profiler)
+            return
+        if executor is None:
+            deliver(_run_batch_handler(batch_handler, batch, profiler))
+            return
+
+        while len(in_flight) >= max_in_flight:
+            deliver(await in_flight.popleft())
+        in_flight.append(loop.run_in_executor(executor, batch_handler, batch))
+        if profiler is not None:
+            profiler.count("batcher.batches")
+            profiler.observe("executor.in_flight", len(in_flight))
+
+    def drain_completed() -> None:
+        """Deliver finished results from the head of the in-flight queue."""
+        while in_flight and in_flight[0].done():
+            deliver(in_flight.popleft().result())
 
     collectors = [asyncio.create_task(collector(stream)) for stream in streams]
 
-    batch = []
-    last_process_time = time.time()
+    try:
+        batch = []
+        last_process_time = time.time()
 
-    while True:
-        try:
-            reading = await asyncio.wait_for(queue.get(), timeout=0.1)
-            batch.append(reading)
-
-            current_time = time.time()
-            should_process = (
-                len(batch) >= batch_size or
-                current_time - last_process_time >= batch_timeout
-            )
-
-            if should_process:
-                for r in batch:
-                    _print_reading(r)
-                batch = []
-                last_process_time = current_time
-
-        except asyncio.TimeoutError:
-            if all(task.done() for task in collectors):
-                if batch:
-                    for r in batch:
-                        _print_reading(r)
-                break
-
-    await asyncio.gather(*collectors)
+        while True:
+            try:
+                reading = await asyncio.wait_for(queue.get(), timeout=0.1)
+                if reorder is not None:
+                    batch.extend(reorder.push(reading))
+                else:
+                    batch.append(reading)
+
+                current_time = time.time()
+                should_process = (
+                    len(batch) >= batch_size or
+                    current_time - last_process_time >= batch_timeout
+                )
+
+                if should_process:
+                    if reorder is not None:
+                        batch.extend(reorder.advance())
+                    # The reorder buffer may have released nothing yet.
+                    if batch:
+                        await dispatch(batch)
+                        batch = []
+                        last_process_time = current_time
+                drain_completed()
+
+            except asyncio.TimeoutError:
+                if all(task.done() for task in collectors):
+                    if reorder is not None:
+                        batch.extend(reorder.flush())
+                    if batch:
+                        await dispatch(batch)
+                    break
+                if reorder is not None:
+                    # Quiet devices never move their own watermark, so
+                    # release them on elapsed time instead.
+                    batch.extend(reorder.advance())
+                    if batch and time.time() - last_process_time >= batch_timeout:
+                        await dispatch(batch)
+                        batch = []
+                        last_process_time = time.time()
+                drain_completed()
+
+        while in_flight:
+            deliver(await in_flight.popleft())
+
+        await asyncio.gather(*collectors)
+    finally:
+        # On a handler error (or cancellation) stop the collectors and wait
+        # for batches already handed to the executor before the exception
+        # propagates. Cancelling those futures would not stop a job that is
+        # already running, so they are awaited instead.
+        for task in collectors:
+            task.cancel()
+        await asyncio.gather(*collectors, *in_flight, return_exceptions=True)
+
+
+def _flush_batch(batch: List[Dict[str, Any]], profiler: Optional[Any]) -> None:
+    """Print a completed batch, recorded as the 'batcher.flush' stage if profiling."""
+    if profiler is None:
+        for r in batch:
+            _print_reading(r)
+        return
+
+    profiler.count("batcher.batches")
+    profiler.observe("batch.size", len(batch))
+    with profiler.stage("batcher.flush"):
+        for r in batch:
+            _print_reading(r)
+
+
+def _run_batch_handler(
+    batch_handler: Callable[[List[Dict[str, Any]]], Any],
+    batch: List[Dict[str, Any]],
+    profiler: Optional[Any]
+) -> Any:
+    """Run batch_handler on the loop thread, recorded as 'batcher.handler' if profiling."""
+    if profiler is None:
+        return batch_handler(batch)
+
+    profiler.count("batcher.batches")
+    profiler.observe("batch.size", len(batch))
+    with profiler.stage("batcher.handler"):
+        return batch_handler(batch)
 
 
 async def main() -> None:
@@ -0,0 +1,393 @@
+"""
+Gorilla Reading Codec
+
+Compact binary encoding for batches of sensor readings, following the
+Gorilla time-series scheme: timestamps as delta-of-delta with variable-width
+buckets, values as XOR against the previous value with leading/trailing
+zero elision.
+
+Block layout (one per device):
+    varint   device_id length, followed by UTF-8 device_id
+    varint   reading count
+    zigzag   first timestamp (varint)
+    8 bytes  first value (big-endian IEEE 754 double)
+    bits     remaining timestamps and values, interleaved, zero-padded
+"""
+
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+_MASK64 = (1 << 64) - 1
+
+# Delta-of-delta buckets: (control bits, control width, payload width).
+# Payloads are two's complement; anything outside the last bucket falls
+# back to a full 64-bit payload.
+_DOD_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+)
+_DOD_FALLBACK = (0b1111, 4, 64)
+
+
+class _BitWriter:
+    """Appends big-endian bit fields to a bytearray."""
+
+    __slots__ = ("out", "acc", "nbits")
+
+    def __init__(self) -> None:
+        self.out = bytearray()
+        self.acc = 0
+        self.nbits = 0
+
+    def write(self, value: int, width: int) -> None:
+        self.acc = (self.acc << width) | value
+        self.nbits += width
+        if self.nbits >= 64:
+            spare = self.nbits & 7
+            self.out += (self.acc >> spare).to_bytes(self.nbits >> 3, "big")
+            self.acc &= (1 << spare) - 1
+            self.nbits = spare
+
+    def getvalue(self) -> bytes:
+        if self.nbits:
+            pad = -self.nbits & 7
+            self.out += (self.acc << pad).to_bytes((self.nbits + pad) >> 3, "big")
+            self.acc = 0
+            self.nbits = 0
+        return bytes(self.out)
+
+
+class _BitReader:
+    """Reads big-endian bit fields from a bytes object."""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes, offset: int = 0) -> None:
+        self.data = data
+        self.pos = offset * 8
+
+    def read(self, width: int) -> int:
+        start = self.pos >> 3
+        end = (self.pos + width + 7) >> 3
+        if end > len(self.data):
+            raise ValueError("truncated Gorilla block")
+        chunk = int.from_bytes(self.data[start:end], "big")
+        shift = (end << 3) - self.pos - width
+        self.pos += width
+        return (chunk >> shift) & ((1 << width) - 1)
+
+    def bit(self) -> int:
+        return self.read(1)
+
+    @property
+    def byte_offset(self) -> int:
+        return (self.pos + 7) >> 3
+
+
+def encode_series(
+    device_id: str,
+    timestamps: Sequence[int],
+    values: Sequence[float]
+) -> bytes:
+    """
+    Encode one device's timestamps and values as a Gorilla block.
+
+    Args:
+        device_id: Device identifier stored in the block header
+        timestamps: Integer timestamps, ideally in increasing order
+        values: Float values, same length as timestamps
+
+    Returns:
+        Encoded block
+    """
+    if len(timestamps) != len(values):
+        raise ValueError("timestamps and values must have the same length")
+
+    name = device_id.encode("utf-8")
+    header = bytearray()
+    _write_varint(header, len(name))
+    header += name
+    _write_varint(header, len(timestamps))
+    if not timestamps:
+        return bytes(header)
+
+    prev_ts = _as_int_timestamp(timestamps[0])
+    prev_bits = _float_bits(values[0])
+    _write_varint(header, _zigzag(prev_ts))
+    header += struct.pack(">Q", prev_bits)
+
+    writer = _BitWriter()
+    write = writer.write
+    prev_delta = 0
+    prev_leading = -1
+    prev_trailing = 0
+
+    for i in range(1, len(timestamps)):
+        ts = _as_int_timestamp(timestamps[i])
+        delta = ts - prev_ts
+        dod = delta - prev_delta
+        prev_ts = ts
+        prev_delta = delta
+
+        if dod == 0:
+            write(0, 1)
+        else:
+            for control, control_width, payload_width in _DOD_BUCKETS:
+                if -(1 << (payload_width - 1)) <= dod < (1 << (payload_width - 1)):
+                    write(control, control_width)
+                    write(dod & ((1 << payload_width) - 1), payload_width)
+                    break
+            else:
+                control, control_width, payload_width = _DOD_FALLBACK
+                write(control, control_width)
+                write(dod & _MASK64, payload_width)
+
+        bits = _float_bits(values[i])
+        xor = bits ^ prev_bits
+        prev_bits = bits
+        if xor == 0:
+            write(0, 1)
+            continue
+
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        if prev_leading >= 0 and leading >= prev_leading and trailing >= prev_trailing:
+            write(0b10, 2)
+            write(xor >> prev_trailing, 64 - prev_leading - prev_trailing)
+        else:
+            meaningful = 64 - leading - trailing
+            write(0b11, 2)
+            write(leading, 5)
+            write(meaningful & 63, 6)
+            write(xor >> trailing, meaningful)
+            prev_leading = leading
+            prev_trailing = trailing
+
+    return bytes(header) + writer.getvalue()
+
+
+def decode_series(data: bytes, offset: int = 0) -> Tuple[str, List[int], List[float], int]:
+    """
+    Decode a Gorilla block produced by encode_series.
+
+    Args:
+        data: Buffer containing the block
+        offset: Byte offset of the block within data
+
+    Returns:
+        Tuple of (device_id, timestamps, values, offset just past the block)
+
+    Raises:
+        ValueError: If the block is truncated
+    """
+    name_len, offset = _read_varint(data, offset)
+    if offset + name_len > len(data):
+        raise ValueError("truncated Gorilla block")
+    device_id = data[offset:offset + name_len].decode("utf-8")
+    offset += name_len
+    count, offset = _read_varint(data, offset)
+    if count == 0:
+        return device_id, [], [], offset
+
+    zigzag, offset = _read_varint(data, offset)
+    prev_ts = _unzigzag(zigzag)
+    if offset + 8 > len(data):
+        raise ValueError("truncated Gorilla block")
+    (prev_bits,) = struct.unpack_from(">Q", data, offset)
+    offset += 8
+
+    timestamps = [prev_ts]
+    values = [_bits_float(prev_bits)]
+    reader = _BitReader(data, offset)
+    read = reader.read
+    bit = reader.bit
+    prev_delta = 0
+    prev_leading = 0
+    prev_trailing = 0
+
+    for _ in range(count - 1):
+        if not bit():
+            dod = 0
+        elif not bit():
+            dod = _signed(read(7), 7)
+        elif not bit():
+            dod = _signed(read(9), 9)
+        elif not bit():
+            dod = _signed(read(12), 12)
+        else:
+            dod = _signed(read(64), 64)
+
+        prev_delta += dod
+        prev_ts += prev_delta
+        timestamps.append(prev_ts)
+
+        if not bit():
+            values.append(_bits_float(prev_bits))
+            continue
+        if not bit():
+            meaningful = 64 - prev_leading - prev_trailing
+            xor = read(meaningful) << prev_trailing
+        else:
+            prev_leading = read(5)
+            meaningful = read(6) or 64
+            prev_trailing = 64 - prev_leading - meaningful
+            xor = read(meaningful) << prev_trailing
+        prev_bits ^= xor
+        values.append(_bits_float(prev_bits))
+
+    return device_id, timestamps, values, reader.byte_offset
+
+
+def encode_batch(readings: List[Dict[str, Any]]) -> bytes:
+    """
+    Encode a batch of readings, possibly from several devices.
+
+    Readings are split per device (keeping each device's order) and each
+    device becomes one block, so the batch can be passed directly as the
+    batch_handler of process_sensor_streams_batched.
+
+    Args:
+        readings: Dicts with 'timestamp', 'device_id', 'value'
+
+    Returns:
+        Encoded batch: varint block count followed by the blocks
+    """
+    per_device: Dict[str, Tuple[List[int], List[float]]] = {}
+    for reading in readings:
+        series = per_device.get(reading["device_id"])
+        if series is None:
+            series = per_device[reading["device_id"]] = ([], [])
+        series[0].append(reading["timestamp"])
+        series[1].append(reading["value"])
+
+    out = bytearray()
+    _write_varint(out, len(per_device))
+    for device_id, (timestamps, values) in per_device.items():
+        out += encode_series(device_id, timestamps, values)
+    return bytes(out)
+
+
+def decode_batch(data: bytes) -> List[Dict[str, Any]]:
+    """
+    Decode a batch produced by encode_batch.
+
+    Returns:
+        Readings grouped by device in first-seen order, each device's
+        readings in their original order
+    """
+    readings, _ = _decode_batch_at(data, 0)
+    return readings
+
+
+def write_batch(f: BinaryIO, readings: List[Dict[str, Any]]) -> int:
+    """
+    Append an encoded, length-prefixed batch to a binary file.
+
+    Returns:
+        Number of bytes written
+    """
+    payload = encode_batch(readings)
+    prefix = bytearray()
+    _write_varint(prefix, len(payload))
+    f.write(prefix)
+    f.write(payload)
+    return len(prefix) + len(payload)
+
+
+def read_batches(f: BinaryIO) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield each batch written by write_batch, in order.
+
+    Frames are read one at a time, so memory use is bounded by the largest
+    batch rather than the file size.
+
+    Raises:
+        ValueError: If the file ends part-way through a frame
+    """
+    while True:
+        length = _read_varint_from(f)
+        if length is None:
+            return
+        payload = f.read(length)
+        if len(payload) != length:
+            raise ValueError("truncated batch frame")
+        yield decode_batch(payload)
+
+
+def _decode_batch_at(data: bytes, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+    blocks, offset = _read_varint(data, offset)
+    readings = []
+    for _ in range(blocks):
+        device_id, timestamps, values, offset = decode_series(data, offset)
+        readings.extend(
+            {"timestamp": ts, "device_id": device_id, "value": value}
+            for ts, value in zip(timestamps, values)
+        )
+    return readings, offset
+
+
+def _as_int_timestamp(timestamp: Any) -> int:
+    if isinstance(timestamp, int):
+        return timestamp
+    if isinstance(timestamp, float) and timestamp.is_integer():
+        return int(timestamp)
+    raise ValueError(f"timestamp must be an integer, got {timestamp!r}")
+
+
+def _float_bits(value: float) -> int:
+    return struct.unpack(">Q", struct.pack(">d", value))[0]
+
+
+def _bits_float(bits: int) -> float:
+    return struct.unpack(">d", struct.pack(">Q", bits))[0]
+
+
+def _signed(value: int, width: int) -> int:
+    return value - (1 << width) if value >> (width - 1) else value
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint_from(f: BinaryIO) -> Optional[int]:
+    """Read a varint from a file; None at a clean end of file."""
+    result = 0
+    shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            if shift:
+                raise ValueError("truncated varint")
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return result
+        shift += 7
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("truncated varint")
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
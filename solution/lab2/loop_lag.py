@@ -0,0 +1,79 @@
+"""
+Event Loop Lag Monitor
+
+Measures how late the event loop wakes up a periodic timer, which is how
+long CPU work on the loop thread delays every other coroutine.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+LAG_INTERVAL = 0.01
+MAX_SAMPLES = 10000
+
+
+class LoopLagMonitor:
+    """
+    Samples event loop lag by sleeping for a fixed interval and recording
+    how much later than requested it resumes.
+
+    Args:
+        interval: Seconds between samples
+        max_samples: Most recent samples retained for percentiles
+    """
+
+    def __init__(self, interval: float = LAG_INTERVAL, max_samples: int = MAX_SAMPLES) -> None:
+        self.interval = interval
+        self.samples: deque = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def summary(self) -> Dict[str, float]:
+        """Return sample count and mean, p99 and max lag in seconds."""
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0.0
+        return {
+            "samples": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p99": p99,
+            "max": self.max,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self.samples.append(lag)
+            self.count += 1
+            self.total += lag
+            if lag > self.max:
+                self.max = lag
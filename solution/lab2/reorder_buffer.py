@@ -0,0 +1,158 @@
+"""
+Reorder Buffer
+
+Per-device bounded reordering of late sensor readings.
+"""
+
+import heapq
+import time
+from collections import OrderedDict
+from itertools import count
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+
+MAX_LATENESS = 5.0
+
+
+class ReorderBuffer:
+    """
+    Re-sequences readings into timestamp order per device.
+
+    Each device has a min-heap keyed on timestamp and a watermark equal to
+    the highest timestamp seen minus max_lateness. Readings at or below the
+    watermark are released in timestamp order; anything that arrives below
+    the last released timestamp for its device is too late to place and is
+    routed to late_handler instead. Buffered readings per device are
+    therefore bounded by max_lateness x reading rate.
+
+    The watermark only moves when the device itself reports, so a device
+    that goes quiet keeps its last max_lateness worth of readings buffered
+    until flush(). With max_idle set, advance() also releases everything
+    held for a device whose last arrival is at least max_idle wall-clock
+    seconds old; a straggler for that device which then arrives below the
+    released readings is treated as late.
+
+    Args:
+        max_lateness: How far (in timestamp units) a reading may trail the
+            newest reading of its device and still be reordered
+        late_handler: Called with each reading that arrives beyond the bound;
+            late readings are counted and dropped when None
+        max_idle: Wall-clock seconds without an arrival after which
+            advance() releases a device's buffered readings; None keeps
+            them until flush()
+    """
+
+    def __init__(
+        self,
+        max_lateness: float = MAX_LATENESS,
+        late_handler: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_idle: Optional[float] = None
+    ) -> None:
+        if max_lateness < 0:
+            raise ValueError("max_lateness must be non-negative")
+        if max_idle is not None and max_idle < 0:
+            raise ValueError("max_idle must be non-negative")
+
+        self.max_lateness = max_lateness
+        self.late_handler = late_handler
+        self.max_idle = max_idle
+        self.late_count = 0
+        self.late_by_device: Dict[str, int] = {}
+        self._heaps: Dict[str, List[Tuple[float, int, Dict[str, Any]]]] = {}
+        self._max_seen: Dict[str, float] = {}
+        self._last_emitted: Dict[str, float] = {}
+        # Devices in order of their last arrival, oldest first.
+        self._last_arrival: "OrderedDict[str, float]" = OrderedDict()
+        self._seq = count()
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._heaps.values())
+
+    def push(self, reading: Dict[str, Any], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Add a reading and return any readings now safe to emit.
+
+        Args:
+            reading: Dict with 'timestamp', 'device_id', 'value'
+            now: Arrival time on the time.monotonic() clock, used by
+                advance(); defaults to the current time when max_idle is set.
+                Must not decrease between calls
+
+        Returns:
+            Readings for the same device, in timestamp order
+        """
+        device_id = reading["device_id"]
+        timestamp = reading["timestamp"]
+        if self.max_idle is not None:
+            self._last_arrival[device_id] = time.monotonic() if now is None else now
+            self._last_arrival.move_to_end(device_id)
+
+        last = self._last_emitted.get(device_id)
+        if last is not None and timestamp < last:
+            self._route_late(reading)
+            return []
+
+        heap = self._heaps.setdefault(device_id, [])
+        heapq.heappush(heap, (timestamp, next(self._seq), reading))
+
+        max_seen = self._max_seen.get(device_id)
+        if max_seen is None or timestamp > max_seen:
+            max_seen = timestamp
+            self._max_seen[device_id] = max_seen
+
+        return self._drain(device_id, max_seen - self.max_lateness)
+
+    def advance(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Release the buffered readings of every device idle for max_idle.
+
+        Only devices that have gone idle since the last call are visited,
+        oldest arrival first, so the cost does not grow with device count.
+
+        Args:
+            now: Current time on the time.monotonic() clock; defaults to now
+
+        Returns:
+            Released readings, each device in timestamp order; always empty
+            when max_idle is None
+        """
+        if self.max_idle is None:
+            return []
+        if now is None:
+            now = time.monotonic()
+        deadline = now - self.max_idle
+        last_arrival = self._last_arrival
+        ready = []
+        while last_arrival:
+            device_id, arrived = next(iter(last_arrival.items()))
+            if arrived > deadline:
+                break
+            del last_arrival[device_id]
+            if device_id in self._heaps:
+                ready.extend(self._drain(device_id, float("inf")))
+        return ready
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Release every buffered reading, each device in timestamp order."""
+        ready = []
+        for device_id in list(self._heaps):
+            ready.extend(self._drain(device_id, float("inf")))
+        return ready
+
+    def _drain(self, device_id: str, watermark: float) -> List[Dict[str, Any]]:
+        """Pop readings at or below the watermark for one device."""
+        heap = self._heaps[device_id]
+        ready = []
+        while heap and heap[0][0] <= watermark:
+            timestamp, _, reading = heapq.heappop(heap)
+            self._last_emitted[device_id] = timestamp
+            ready.append(reading)
+        return ready
+
+    def _route_late(self, reading: Dict[str, Any]) -> None:
+        """Count a reading that missed its slot and hand it to the side channel."""
+        device_id = reading["device_id"]
+        self.late_count += 1
+        self.late_by_device[device_id] = self.late_by_device.get(device_id, 0) + 1
+        if self.late_handler is not None:
+            self.late_handler(reading)
@@ -3,7 +3,10 @@ Tests for Async Sensor Stream Processor
 """
 
 import asyncio
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import AsyncMock, patch, MagicMock
 from io import StringIO
 from async_sensor_processor import (
@@ -157,5 +160,154 @@ class TestBatchedProcessing(unittest.TestCase):
         asyncio.run(run_test())
 
 
+def _sum_values(batch):
+    return sum(r["value"] for r in batch)
+
+
+class TestExecutorOffload(unittest.TestCase):
+    """Test cases for batch handling and executor offload."""
+
+    @staticmethod
+    async def _stream(device_id: str, count: int):
+        for i in range(count):
+            await asyncio.sleep(0.001)
+            yield {"device_id": device_id, "value": float(i)}
+
+    def test_inline_batch_handler(self):
+        """Test that a batch handler replaces printing on the loop thread."""
+        async def run_test():
+            results = []
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                await process_sensor_streams_batched(
+                    [self._stream("sensor_1", 6)], batch_size=2, batch_timeout=10,
+                    batch_handler=_sum_values, result_handler=results.append
+                )
+                self.assertEqual(mock_stdout.getvalue(), "")
+            return results
+
+        self.assertEqual(asyncio.run(run_test()), [1.0, 5.0, 9.0])
+
+    def test_executor_results_in_order(self):
+        """Test that offloaded results are delivered in batch order."""
+        def slow_first(batch):
+            if batch[0]["value"] == 0.0:
+                time.sleep(0.05)
+            return [r["value"] for r in batch]
+
+        async def run_test():
+            results = []
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                await process_sensor_streams_batched(
+                    [self._stream("sensor_1", 8)], batch_size=2, batch_timeout=10,
+                    batch_handler=slow_first, result_handler=results.append,
+                    executor=executor
+                )
+            return results
+
+        self.assertEqual(
+            asyncio.run(run_test()),
+            [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0], [6.0, 7.0]]
+        )
+
+    def test_in_flight_bounded(self):
+        """Test that no more than max_in_flight batches run concurrently."""
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def handler(batch):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return len(batch)
+
+        async def run_test():
+            results = []
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                await process_sensor_streams_batched(
+                    [self._stream("sensor_1", 20), self._stream("sensor_2", 20)],
+                    batch_size=2, batch_timeout=10,
+                    batch_handler=handler, result_handler=results.append,
+                    executor=executor, max_in_flight=2
+                )
+            return results
+
+        results = asyncio.run(run_test())
+        self.assertEqual(sum(results), 40)
+        self.assertLessEqual(peak[0], 2)
+
+    def test_handler_error_cleans_up(self):
+        """Test that a failing handler cancels collectors and settles in-flight work."""
+        def failing(batch):
+            if batch[0]["value"] == 2.0:
+                raise RuntimeError("handler failed")
+            time.sleep(0.01)
+            return len(batch)
+
+        async def endless(device_id: str):
+            i = 0
+            while True:
+                await asyncio.sleep(0.001)
+                yield {"device_id": device_id, "value": float(i)}
+                i += 1
+
+        async def run_test():
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                with self.assertRaises(RuntimeError):
+                    await process_sensor_streams_batched(
+                        [endless("sensor_1"), endless("sensor_2")],
+                        batch_size=2, batch_timeout=10,
+                        batch_handler=failing, executor=executor
+                    )
+            current = asyncio.current_task()
+            return [t for t in asyncio.all_tasks() if t is not current]
+
+        self.assertEqual(asyncio.run(run_test()), [])
+
+    def test_handler_error_waits_for_running_jobs(self):
+        """Test that no executor job is still running once the error propagates."""
+        lock = threading.Lock()
+        running = [0]
+
+        def slow_or_failing(batch):
+            with lock:
+                running[0] += 1
+            try:
+                if batch[0]["value"] == 0.0:
+                    # Fail once later batches have been submitted.
+                    time.sleep(0.01)
+                    raise RuntimeError("handler failed")
+                time.sleep(0.1)
+                return len(batch)
+            finally:
+                with lock:
+                    running[0] -= 1
+
+        async def run_test():
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                with self.assertRaises(RuntimeError):
+                    await process_sensor_streams_batched(
+                        [self._stream("sensor_1", 40)],
+                        batch_size=2, batch_timeout=10,
+                        batch_handler=slow_or_failing, executor=executor
+                    )
+                with lock:
+                    return running[0]
+
+        self.assertEqual(asyncio.run(run_test()), 0)
+
+    def test_executor_requires_handler(self):
+        """Test that an executor without a batch handler is rejected."""
+        async def run_test():
+            with ThreadPoolExecutor() as executor:
+                await process_sensor_streams_batched([], executor=executor)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run_test())
+
+
 if __name__ == "__main__":
     unittest.main()
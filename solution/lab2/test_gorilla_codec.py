@@ -0,0 +1,207 @@
+"""
+Tests for Gorilla Reading Codec
+"""
+
+import asyncio
+import io
+import json
+import math
+import random
+import struct
+import unittest
+from async_sensor_processor import process_sensor_streams_batched
+from gorilla_codec import (
+    encode_series,
+    decode_series,
+    encode_batch,
+    decode_batch,
+    write_batch,
+    read_batches
+)
+
+
+class TestGorillaSeries(unittest.TestCase):
+    """Test cases for single-device series encoding."""
+
+    def assertRoundTrip(self, timestamps, values):
+        data = encode_series("sensor_1", timestamps, values)
+        device_id, ts_out, values_out, offset = decode_series(data)
+
+        self.assertEqual(device_id, "sensor_1")
+        self.assertEqual(ts_out, list(timestamps))
+        self.assertEqual(
+            [struct.pack(">d", v) for v in values_out],
+            [struct.pack(">d", v) for v in values]
+        )
+        self.assertEqual(offset, len(data))
+        return data
+
+    def test_empty_series(self):
+        """Test encoding a device with no readings."""
+        self.assertRoundTrip([], [])
+
+    def test_single_reading(self):
+        """Test encoding a single reading."""
+        self.assertRoundTrip([1698000000], [23.5])
+
+    def test_regular_interval_compresses(self):
+        """Test that fixed-interval, repeated values cost about two bits each."""
+        timestamps = list(range(1698000000, 1698000000 + 1000 * 5, 5))
+        data = self.assertRoundTrip(timestamps, [23.5] * 1000)
+        self.assertLess(len(data), 1000 * 2 // 8 + 32)
+
+    def test_all_delta_of_delta_buckets(self):
+        """Test timestamp jumps that hit every delta-of-delta bucket."""
+        timestamps = [1698000000]
+        for jump in [5, 5, 68, 5, 250, 5, 2000, 5, 10 ** 6, 5, -63, 5, -3000, 5]:
+            timestamps.append(timestamps[-1] + jump)
+        self.assertRoundTrip(timestamps, [20.0] * len(timestamps))
+
+    def test_bucket_edges(self):
+        """Test delta-of-delta values at the two's complement limits."""
+        for dod in [-64, 63, 64, -65, -256, 255, 256, -2048, 2047, 2048, -2049]:
+            timestamps = [0, 100, 200 + dod]
+            self.assertRoundTrip(timestamps, [1.0, 1.0, 1.0])
+
+    def test_value_edge_cases(self):
+        """Test sign changes, zeros, infinities and extreme magnitudes."""
+        values = [0.0, -0.0, 1.0, -1.0, 1e308, -1e-308, math.inf, -math.inf, 5e-324, 23.5, 23.5]
+        timestamps = list(range(len(values)))
+        self.assertRoundTrip(timestamps, values)
+
+    def test_nan_preserved(self):
+        """Test that NaN round-trips bit-exactly."""
+        data = encode_series("sensor_1", [0, 5], [math.nan, 1.0])
+        _, _, values, _ = decode_series(data)
+        self.assertTrue(math.isnan(values[0]))
+        self.assertEqual(values[1], 1.0)
+
+    def test_random_round_trip(self):
+        """Test random walks with jittered, out-of-order timestamps."""
+        rng = random.Random(7)
+        for _ in range(20):
+            n = rng.randrange(1, 300)
+            timestamps = [1698000000 + i * 5 + rng.randrange(-3, 4) for i in range(n)]
+            values = [round(20 + rng.gauss(0, 2), rng.randrange(0, 4)) for _ in range(n)]
+            self.assertRoundTrip(timestamps, values)
+
+    def test_non_integer_timestamp_rejected(self):
+        """Test that fractional timestamps are rejected."""
+        with self.assertRaises(ValueError):
+            encode_series("sensor_1", [0, 1.5], [1.0, 2.0])
+
+    def test_length_mismatch_rejected(self):
+        """Test that timestamps and values must align."""
+        with self.assertRaises(ValueError):
+            encode_series("sensor_1", [0, 1], [1.0])
+
+    def test_truncated_block(self):
+        """Test that a truncated block raises instead of returning garbage."""
+        timestamps = list(range(0, 500, 5))
+        values = [20.0 + i * 0.37 for i in range(100)]
+        data = encode_series("sensor_1", timestamps, values)
+        with self.assertRaises(ValueError):
+            decode_series(data[:len(data) // 2])
+
+    def test_every_truncation_raises_value_error(self):
+        """Test that a cut in the header, name or first value also raises ValueError."""
+        data = encode_batch([
+            {"timestamp": 1698000000, "device_id": "sensor_1", "value": 23.5},
+            {"timestamp": 1698000005, "device_id": "sensor_1", "value": 23.7},
+        ])
+        for cut in range(1, len(data)):
+            with self.subTest(cut=cut):
+                with self.assertRaises(ValueError):
+                    decode_batch(data[:cut])
+
+
+class TestGorillaBatch(unittest.TestCase):
+    """Test cases for multi-device batch encoding."""
+
+    def setUp(self):
+        self.readings = [
+            {"timestamp": 1698000000, "device_id": "sensor_1", "value": 23.5},
+            {"timestamp": 1698000005, "device_id": "sensor_1", "value": 23.7},
+            {"timestamp": 1698000010, "device_id": "sensor_2", "value": 45.2},
+            {"timestamp": 1698000015, "device_id": "sensor_1", "value": 28.1},
+            {"timestamp": 1698000060, "device_id": "sensor_2", "value": 45.8},
+        ]
+
+    def test_batch_round_trip(self):
+        """Test that a mixed batch decodes grouped by device."""
+        decoded = decode_batch(encode_batch(self.readings))
+
+        self.assertEqual(decoded, [
+            self.readings[0], self.readings[1], self.readings[3],
+            self.readings[2], self.readings[4],
+        ])
+
+    def test_empty_batch(self):
+        """Test encoding an empty batch."""
+        self.assertEqual(decode_batch(encode_batch([])), [])
+
+    def test_smaller_than_json(self):
+        """Test that encoded batches are smaller than JSON."""
+        readings = [
+            {"timestamp": 1698000000 + i * 5, "device_id": f"sensor_{i % 3}", "value": round(20 + i * 0.1, 1)}
+            for i in range(300)
+        ]
+        self.assertLess(len(encode_batch(readings)), len(json.dumps(readings)) // 4)
+
+    def test_file_round_trip(self):
+        """Test writing and reading length-prefixed batches."""
+        f = io.BytesIO()
+        written = write_batch(f, self.readings[:2]) + write_batch(f, self.readings[2:])
+        self.assertEqual(written, len(f.getvalue()))
+
+        f.seek(0)
+        batches = list(read_batches(f))
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(batches[0], self.readings[:2])
+        self.assertEqual(len(batches[1]), 3)
+
+    def test_file_read_is_incremental(self):
+        """Test that batches are read frame by frame, not all at once."""
+        f = io.BytesIO()
+        sizes = [write_batch(f, self.readings) for _ in range(5)]
+        f.seek(0)
+
+        batches = read_batches(f)
+        self.assertEqual(f.tell(), 0)
+        self.assertEqual(next(batches), decode_batch(encode_batch(self.readings)))
+        self.assertEqual(f.tell(), sizes[0])
+        self.assertEqual(len(list(batches)), 4)
+        self.assertEqual(f.tell(), sum(sizes))
+
+    def test_truncated_file_frame(self):
+        """Test that a frame cut short at end of file raises."""
+        f = io.BytesIO()
+        write_batch(f, self.readings)
+        truncated = io.BytesIO(f.getvalue()[:-3])
+
+        with self.assertRaises(ValueError):
+            list(read_batches(truncated))
+
+    def test_as_batch_handler(self):
+        """Test encoding batches inside the batched async processor."""
+        async def run_test():
+            async def stream(readings):
+                for reading in readings:
+                    await asyncio.sleep(0.001)
+                    yield reading
+
+            encoded = []
+            await process_sensor_streams_batched(
+                [stream(self.readings)], batch_size=2, batch_timeout=10,
+                batch_handler=encode_batch, result_handler=encoded.append
+            )
+            return encoded
+
+        encoded = asyncio.run(run_test())
+        decoded = [r for payload in encoded for r in decode_batch(payload)]
+        self.assertEqual(len(encoded), 3)
+        self.assertEqual(decoded, self.readings)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+Tests for Event Loop Lag Monitor
+"""
+
+import asyncio
+import time
+import unittest
+from loop_lag import LoopLagMonitor
+
+
+class TestLoopLagMonitor(unittest.TestCase):
+    """Test cases for LoopLagMonitor."""
+
+    def test_blocking_work_shows_as_lag(self):
+        """Test that blocking the loop thread is reported as lag."""
+        async def run_test():
+            async with LoopLagMonitor(interval=0.005) as monitor:
+                await asyncio.sleep(0.02)
+                time.sleep(0.1)
+                await asyncio.sleep(0.02)
+            return monitor.summary()
+
+        summary = asyncio.run(run_test())
+        self.assertGreater(summary["samples"], 0)
+        self.assertGreaterEqual(summary["max"], 0.05)
+        self.assertLessEqual(summary["p99"], summary["max"])
+
+    def test_empty_summary(self):
+        """Test summary before any samples are taken."""
+        summary = LoopLagMonitor().summary()
+        self.assertEqual(summary, {"samples": 0, "mean": 0.0, "p99": 0.0, "max": 0.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Tests for Reorder Buffer
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+from io import StringIO
+from reorder_buffer import ReorderBuffer
+from async_sensor_processor import process_sensor_streams_batched
+
+
+def _reading(device_id, timestamp, value=20.0):
+    return {"timestamp": timestamp, "device_id": device_id, "value": value}
+
+
+class TestReorderBuffer(unittest.TestCase):
+    """Test cases for ReorderBuffer."""
+
+    def test_in_order_released_after_lateness(self):
+        """Test that readings are held until the watermark passes them."""
+        buffer = ReorderBuffer(max_lateness=10)
+
+        self.assertEqual(buffer.push(_reading("sensor_1", 100)), [])
+        self.assertEqual(buffer.push(_reading("sensor_1", 105)), [])
+
+        ready = buffer.push(_reading("sensor_1", 112))
+        self.assertEqual([r["timestamp"] for r in ready], [100])
+        self.assertEqual(len(buffer), 2)
+
+    def test_reorders_within_bound(self):
+        """Test that out-of-order readings within the bound are re-sequenced."""
+        buffer = ReorderBuffer(max_lateness=10)
+        emitted = []
+        for ts in [100, 110, 105, 103, 120, 130]:
+            emitted.extend(buffer.push(_reading("sensor_1", ts)))
+        emitted.extend(buffer.flush())
+
+        self.assertEqual(
+            [r["timestamp"] for r in emitted],
+            [100, 103, 105, 110, 120, 130]
+        )
+        self.assertEqual(buffer.late_count, 0)
+
+    def test_late_readings_routed_and_counted(self):
+        """Test that readings beyond the bound go to the side channel."""
+        late = []
+        buffer = ReorderBuffer(max_lateness=5, late_handler=late.append)
+        emitted = []
+        for ts in [100, 110, 120, 102]:
+            emitted.extend(buffer.push(_reading("sensor_1", ts)))
+        emitted.extend(buffer.flush())
+
+        self.assertEqual([r["timestamp"] for r in emitted], [100, 110, 120])
+        self.assertEqual([r["timestamp"] for r in late], [102])
+        self.assertEqual(buffer.late_count, 1)
+        self.assertEqual(buffer.late_by_device, {"sensor_1": 1})
+
+    def test_devices_are_independent(self):
+        """Test that one device's watermark does not release another's."""
+        buffer = ReorderBuffer(max_lateness=10)
+        buffer.push(_reading("sensor_1", 100))
+
+        ready = buffer.push(_reading("sensor_2", 500))
+        self.assertEqual(ready, [])
+        self.assertEqual(len(buffer), 2)
+
+        late_free = buffer.push(_reading("sensor_1", 95))
+        self.assertEqual(late_free, [])
+        self.assertEqual(buffer.late_count, 0)
+
+    def test_buffer_bounded_by_lateness(self):
+        """Test that buffered readings never exceed the lateness window."""
+        buffer = ReorderBuffer(max_lateness=20)
+        for ts in range(0, 10000, 5):
+            buffer.push(_reading("sensor_1", ts))
+            self.assertLessEqual(len(buffer), 5)
+
+    def test_zero_lateness_passthrough(self):
+        """Test that zero lateness emits in-order readings immediately."""
+        buffer = ReorderBuffer(max_lateness=0)
+        self.assertEqual(len(buffer.push(_reading("sensor_1", 1))), 1)
+        self.assertEqual(len(buffer.push(_reading("sensor_1", 2))), 1)
+        self.assertEqual(buffer.push(_reading("sensor_1", 1)), [])
+        self.assertEqual(buffer.late_count, 1)
+
+    def test_negative_lateness_rejected(self):
+        """Test that a negative bound is rejected."""
+        with self.assertRaises(ValueError):
+            ReorderBuffer(max_lateness=-1)
+        with self.assertRaises(ValueError):
+            ReorderBuffer(max_idle=-1)
+
+    def test_advance_releases_idle_device(self):
+        """Test that a device that stops reporting is released on elapsed time."""
+        buffer = ReorderBuffer(max_lateness=10, max_idle=2.0)
+        buffer.push(_reading("sensor_1", 100), now=0.0)
+        buffer.push(_reading("sensor_1", 95), now=0.5)
+        buffer.push(_reading("sensor_2", 100), now=1.5)
+
+        self.assertEqual(buffer.advance(now=1.0), [])
+
+        ready = buffer.advance(now=2.5)
+        self.assertEqual([(r["device_id"], r["timestamp"]) for r in ready],
+                         [("sensor_1", 95), ("sensor_1", 100)])
+        self.assertEqual(len(buffer), 1)
+
+        buffer.push(_reading("sensor_1", 98), now=3.0)
+        self.assertEqual(buffer.late_count, 1)
+        self.assertEqual([r["device_id"] for r in buffer.advance(now=3.5)], ["sensor_2"])
+
+    def test_advance_without_max_idle(self):
+        """Test that readings stay buffered until flush when max_idle is unset."""
+        buffer = ReorderBuffer(max_lateness=10)
+        buffer.push(_reading("sensor_1", 100))
+        self.assertEqual(buffer.advance(now=10 ** 9), [])
+        self.assertEqual(len(buffer.flush()), 1)
+
+
+class TestBatchedReordering(unittest.TestCase):
+    """Test cases for reordering inside batched processing."""
+
+    def test_batched_processing_reorders_per_device(self):
+        """Test that batched output is timestamp-ordered per device."""
+        async def run_test():
+            async def jittered_stream(device_id: str, timestamps):
+                for ts in timestamps:
+                    await asyncio.sleep(0.01)
+                    yield {"timestamp": ts, "device_id": device_id, "value": float(ts)}
+
+            late = []
+            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                streams = [
+                    jittered_stream("sensor_1", [10, 30, 20, 40, 5]),
+                    jittered_stream("sensor_2", [12, 11, 13]),
+                ]
+                await process_sensor_streams_batched(
+                    streams, batch_size=2, batch_timeout=0.1,
+                    max_lateness=15, late_handler=late.append
+                )
+
+                lines = mock_stdout.getvalue().strip().split("\n")
+                sensor_1 = [line for line in lines if line.startswith("sensor_1")]
+                sensor_2 = [line for line in lines if line.startswith("sensor_2")]
+
+                self.assertEqual(sensor_1, [
+                    "sensor_1: value=10.0",
+                    "sensor_1: value=20.0",
+                    "sensor_1: value=30.0",
+                    "sensor_1: value=40.0",
+                ])
+                self.assertEqual(sensor_2, [
+                    "sensor_2: value=11.0",
+                    "sensor_2: value=12.0",
+                    "sensor_2: value=13.0",
+                ])
+                self.assertEqual([r["timestamp"] for r in late], [5])
+
+        asyncio.run(run_test())
+
+    def test_quiet_device_released_before_end(self):
+        """Test that a device that stops reporting is emitted while others continue."""
+        async def run_test():
+            async def stream(device_id: str, count: int):
+                for ts in range(count):
+                    await asyncio.sleep(0.01)
+                    yield {"timestamp": ts, "device_id": device_id, "value": float(ts)}
+
+            batches = []
+            await process_sensor_streams_batched(
+                [stream("sensor_1", 2), stream("sensor_2", 40)],
+                batch_size=5, batch_timeout=0.05, max_lateness=1000,
+                batch_handler=lambda batch: batches.append(list(batch))
+            )
+
+            released = [
+                i for i, batch in enumerate(batches)
+                if any(r["device_id"] == "sensor_1" for r in batch)
+            ]
+            self.assertEqual(len(released), 1)
+            self.assertLess(released[0], len(batches) - 1)
+
+        asyncio.run(run_test())
+
+    def test_no_empty_batches_while_buffering(self):
+        """Test that elapsed time alone never dispatches an empty batch."""
+        async def run_test():
+            async def stream(count: int):
+                for ts in range(count):
+                    await asyncio.sleep(0.01)
+                    yield {"timestamp": ts, "device_id": "sensor_1", "value": float(ts)}
+
+            sizes = []
+            await process_sensor_streams_batched(
+                [stream(30)], batch_size=100, batch_timeout=0.05, max_lateness=1000,
+                batch_handler=len, result_handler=sizes.append
+            )
+
+            self.assertNotIn(0, sizes)
+            self.assertEqual(sum(sizes), 30)
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    unittest.main()
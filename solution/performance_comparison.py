@@ -5,8 +5,12 @@ Compares performance characteristics of synchronous grouping
 vs asynchronous stream processing.
 """
 
+import json
 import time
 import asyncio
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Dict, Any
 import sys
 import os
@@ -15,7 +19,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'lab1'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'lab2'))
 
 from sensor_aggregator import group_sensor_readings
-from async_sensor_processor import process_sensor_streams
+from async_sensor_processor import process_sensor_streams, process_sensor_streams_batched
+from loop_lag import LoopLagMonitor
+from gorilla_codec import encode_batch, decode_batch
+from load_generator import LoadGenerator
 
 
 def generate_test_data(num_devices: int, readings_per_device: int) -> List[Dict[str, Any]]:
@@ -76,6 +83,66 @@ async def benchmark_async_processing(
     return end - start
 
 
+def compress_batch(batch: List[Dict[str, Any]]) -> bytes:
+    """Pack a batch into columns and zlib-compress it; zlib releases the GIL."""
+    timestamps = array("q", [r["timestamp"] for r in batch])
+    values = array("d", [r["value"] for r in batch])
+    return zlib.compress(timestamps.tobytes() + values.tobytes(), 9)
+
+
+async def replay_stream(data: List[Dict[str, Any]], yield_every: int = 500):
+    """Replay pre-generated readings, yielding to the loop every few readings."""
+    for i, reading in enumerate(data):
+        if i % yield_every == 0:
+            await asyncio.sleep(0)
+        yield reading
+
+
+async def benchmark_offload(
+    data: List[Dict[str, Any]],
+    batch_handler,
+    executor=None
+) -> Dict[str, float]:
+    """Measure event loop lag while batches are handled inline or in an executor."""
+    async with LoopLagMonitor() as monitor:
+        await process_sensor_streams_batched(
+            [replay_stream(data)],
+            batch_size=20000,
+            batch_handler=batch_handler,
+            executor=executor
+        )
+    return monitor.summary()
+
+
+def _lag_ratio(inline: float, offloaded: float) -> str:
+    """Describe offloaded lag relative to inline lag, e.g. '3.3x lower'."""
+    if offloaded <= 0.0 or inline <= 0.0:
+        return "n/a"
+    ratio = inline / offloaded
+    return f"{ratio:.1f}x lower" if ratio >= 1.0 else f"{1 / ratio:.1f}x higher"
+
+
+def benchmark_codec(readings: List[Dict[str, Any]], batch_size: int = 1000) -> Dict[str, float]:
+    """Measure Gorilla batch size and encode/decode throughput."""
+    batches = [readings[i:i + batch_size] for i in range(0, len(readings), batch_size)]
+
+    start = time.perf_counter()
+    encoded = [encode_batch(batch) for batch in batches]
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for payload in encoded:
+        decode_batch(payload)
+    decode_time = time.perf_counter() - start
+
+    return {
+        "bytes_per_reading": sum(len(p) for p in encoded) / len(readings),
+        "json_bytes_per_reading": sum(len(json.dumps(b)) for b in batches) / len(readings),
+        "encode_rate": len(readings) / encode_time,
+        "decode_rate": len(readings) / decode_time,
+    }
+
+
 def run_benchmarks():
     """Run comprehensive benchmarks."""
     print("=" * 60)
@@ -116,6 +183,55 @@ def run_benchmarks():
         print(f"\n  Speedup: {speedup:.2f}x")
         print("  " + "-" * 56)
 
+    print("\nDevice-Switching Workload (Lab1):")
+    for switch_probability in (0.01, 0.1, 0.5):
+        generator = LoadGenerator(
+            num_devices=1000,
+            switch_probability=switch_probability,
+            seed=42
+        )
+        data = generator.readings(100000)
+        sync_time = benchmark_sync_processing(data)
+        print(f"  Switch probability {switch_probability:.2f}: "
+              f"{len(data) / sync_time:.0f} readings/s")
+
+    # Readings are generated before any lag monitor starts so the generator
+    # does not show up as loop lag.
+    offload_data = LoadGenerator(num_devices=100, seed=42).readings(200000)
+    workloads = (
+        ("pack + zlib, releases the GIL", compress_batch),
+        ("group_sensor_readings, holds the GIL", group_sensor_readings),
+    )
+    with ThreadPoolExecutor(max_workers=2) as thread_pool, \
+            ProcessPoolExecutor(max_workers=2) as process_pool:
+        for label, handler in workloads:
+            print(f"\nBatch Offload Event Loop Lag (20K-reading batches, {label}):")
+            inline = None
+            for mode, executor in (("Inline", None), ("Thread pool", thread_pool),
+                                   ("Process pool", process_pool)):
+                lag = asyncio.run(benchmark_offload(offload_data, handler, executor))
+                line = (f"  {mode:<13} mean={lag['mean'] * 1000:.2f}ms "
+                        f"p99={lag['p99'] * 1000:.2f}ms max={lag['max'] * 1000:.2f}ms")
+                if inline is None:
+                    inline = lag
+                else:
+                    # Report the measured change rather than an expectation.
+                    line += (f"  (p99 {_lag_ratio(inline['p99'], lag['p99'])}, "
+                             f"max {_lag_ratio(inline['max'], lag['max'])} vs inline)")
+                print(line)
+
+    print("\nGorilla Batch Encoding (100K readings, 1000-reading batches):")
+    generator = LoadGenerator(num_devices=100, switch_probability=0.05, seed=42)
+    for label, decimals in (("0.1 resolution", 1), ("0.01 resolution", 2), ("Full precision", None)):
+        data = generator.readings(100000)
+        if decimals is not None:
+            for reading in data:
+                reading["value"] = round(reading["value"], decimals)
+        stats = benchmark_codec(data)
+        print(f"  {label:<16} {stats['bytes_per_reading']:.2f} B/reading "
+              f"(JSON {stats['json_bytes_per_reading']:.1f}), "
+              f"encode {stats['encode_rate']:.0f}/s, decode {stats['decode_rate']:.0f}/s")
+
     print("\n" + "=" * 60)
     print("\nMemory Characteristics:")
     print("=" * 60)
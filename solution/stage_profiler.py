@@ -0,0 +1,298 @@
+"""
+Stage Profiler
+
+Opt-in memory and CPU profiling for the aggregation hot paths.
+Pass a StageProfiler as the 'profiler' argument of group_sensor_readings
+or process_sensor_streams_batched to attribute allocations to stages.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+SNAPSHOT_INTERVAL = 1.0
+TOP_N = 15
+TRACEMALLOC_FRAMES = 1
+REPORT_PATH = "profile_report.txt"
+
+
+class _StageStats:
+    """
+    Accumulated timings and memory deltas for one stage.
+
+    net_bytes and net_blocks are what the stage left allocated on exit;
+    peak_bytes is the highest traced memory seen inside any single call,
+    measured above the level at which that call started.
+    """
+
+    __slots__ = ("calls", "seconds", "net_bytes", "net_blocks", "peak_bytes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.net_bytes = 0
+        self.net_blocks = 0
+        self.peak_bytes = 0
+
+
+class StageProfiler:
+    """
+    Collects per-stage allocation stats, periodic tracemalloc snapshots and
+    optional cProfile output, then writes them to a local report file.
+
+    Snapshots are taken at most every snapshot_interval seconds from within
+    instrumented stages. Only the baseline and previous snapshots are
+    retained; each new one is diffed against the previous immediately and
+    the top entries are kept as text. stop() also diffs the final snapshot
+    against the baseline to show what the whole run retained.
+
+    Args:
+        report_path: File the report is written to on stop()
+        snapshot_interval: Minimum seconds between tracemalloc snapshots
+        use_cprofile: Also run cProfile while the profiler is active
+        top_n: Number of entries shown per snapshot diff and cProfile listing
+        frames: Traceback depth recorded by tracemalloc
+    """
+
+    def __init__(
+        self,
+        report_path: str = REPORT_PATH,
+        snapshot_interval: float = SNAPSHOT_INTERVAL,
+        use_cprofile: bool = True,
+        top_n: int = TOP_N,
+        frames: int = TRACEMALLOC_FRAMES
+    ) -> None:
+        self.report_path = report_path
+        self.snapshot_interval = snapshot_interval
+        self.use_cprofile = use_cprofile
+        self.top_n = top_n
+        self.frames = frames
+
+        self.stages: Dict[str, _StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Dict[str, float]] = {}
+        self.snapshot_diffs: List[str] = []
+
+        self._profile: Optional[cProfile.Profile] = None
+        self._owns_tracemalloc = False
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_snapshot_time = 0.0
+        self._started_at = 0.0
+        self._overhead_bytes = 0
+        self._overhead_blocks = 0
+        self._peak_stack: List[int] = []
+        self._active = False
+
+    def __enter__(self) -> "StageProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Begin tracing and take the baseline snapshot."""
+        if self._active:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracemalloc = True
+        self._started_at = time.perf_counter()
+        self._baseline = self._last_snapshot = self._take_snapshot()
+        self._last_snapshot_time = self._started_at
+        if self.use_cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._active = True
+
+    def stop(self) -> str:
+        """
+        Take a final snapshot, stop tracing and write the report.
+
+        Returns:
+            The report text
+        """
+        if not self._active:
+            return ""
+        if self._profile is not None:
+            self._profile.disable()
+        self.snapshot("final")
+        self.snapshot_diffs.append(self._format_diff(
+            "final (vs baseline)", self._last_snapshot, self._baseline
+        ))
+        self._baseline = self._last_snapshot = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        self._active = False
+
+        report = self.format_report()
+        with open(self.report_path, "w") as f:
+            f.write(report)
+        return report
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Attribute wall time, net memory and blocks, and peak memory to a stage."""
+        if not self._active:
+            yield
+            return
+
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = _StageStats()
+
+        # tracemalloc keeps a single process-wide peak, so it is reset on
+        # entry and the enclosing stage's peak so far is carried on a stack
+        # and folded back in on exit.
+        self._carry_peak()
+        self._peak_stack.append(0)
+        tracemalloc.reset_peak()
+
+        before, _ = tracemalloc.get_traced_memory()
+        blocks_before = sys.getallocatedblocks()
+        overhead_before = self._overhead_bytes
+        overhead_blocks_before = self._overhead_blocks
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._peak_stack.pop())
+            if self._peak_stack:
+                self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+
+            stats.calls += 1
+            stats.seconds += time.perf_counter() - start
+            stats.net_bytes += after - before - (self._overhead_bytes - overhead_before)
+            stats.net_blocks += (
+                sys.getallocatedblocks() - blocks_before
+                - (self._overhead_blocks - overhead_blocks_before)
+            )
+            stats.peak_bytes = max(stats.peak_bytes, peak - before)
+            self.sample()
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Return func instrumented as a stage."""
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increment a named counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float) -> None:
+        """Record the latest and maximum value of a gauge such as queue depth."""
+        gauge = self.gauges.get(name)
+        if gauge is None:
+            self.gauges[name] = {"last": value, "max": value}
+        else:
+            gauge["last"] = value
+            if value > gauge["max"]:
+                gauge["max"] = value
+
+    def sample(self) -> None:
+        """Take a snapshot if snapshot_interval has elapsed."""
+        if self._active and time.perf_counter() - self._last_snapshot_time >= self.snapshot_interval:
+            self.snapshot()
+
+    def snapshot(self, label: Optional[str] = None) -> None:
+        """Take a snapshot now and record its diff against the previous one."""
+        if not tracemalloc.is_tracing():
+            return
+        now = time.perf_counter()
+        self._carry_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        blocks_before = sys.getallocatedblocks()
+        current = self._take_snapshot()
+        if label is None:
+            label = f"t+{now - self._started_at:.3f}s"
+
+        self.snapshot_diffs.append(self._format_diff(
+            f"{label} (vs previous)", current, self._last_snapshot
+        ))
+
+        self._last_snapshot = current
+        self._last_snapshot_time = now
+        after, _ = tracemalloc.get_traced_memory()
+        self._overhead_bytes += after - before
+        self._overhead_blocks += sys.getallocatedblocks() - blocks_before
+        # Keep the snapshot's own transient memory out of stage peaks.
+        tracemalloc.reset_peak()
+
+    def format_report(self) -> str:
+        """Render stages, counters, gauges, snapshot diffs and cProfile output."""
+        out = io.StringIO()
+        out.write("Stage Profile Report\n")
+        out.write("=" * 60 + "\n\n")
+
+        out.write("Stages:\n")
+        out.write(
+            f"  {'stage':<28}{'calls':>10}{'seconds':>12}{'net KiB':>12}"
+            f"{'net blocks':>12}{'peak KiB':>12}\n"
+        )
+        for name, stats in self.stages.items():
+            out.write(
+                f"  {name:<28}{stats.calls:>10}{stats.seconds:>12.4f}"
+                f"{stats.net_bytes / 1024:>12.1f}{stats.net_blocks:>12}"
+                f"{stats.peak_bytes / 1024:>12.1f}\n"
+            )
+
+        if self.counters:
+            out.write("\nCounters:\n")
+            for name, value in self.counters.items():
+                out.write(f"  {name}: {value}\n")
+
+        if self.gauges:
+            out.write("\nGauges:\n")
+            for name, gauge in self.gauges.items():
+                out.write(f"  {name}: last={gauge['last']} max={gauge['max']}\n")
+
+        out.write("\nSnapshot diffs:\n")
+        for diff in self.snapshot_diffs:
+            out.write(diff + "\n")
+
+        if self._profile is not None:
+            out.write("\ncProfile (cumulative):\n")
+            stream = io.StringIO()
+            pstats.Stats(self._profile, stream=stream).sort_stats("cumulative").print_stats(self.top_n)
+            out.write(stream.getvalue())
+
+        return out.getvalue()
+
+    def _carry_peak(self) -> None:
+        """Fold the current tracemalloc peak into the innermost open stage."""
+        if self._peak_stack:
+            _, peak = tracemalloc.get_traced_memory()
+            self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+
+    def _format_diff(
+        self,
+        title: str,
+        current: tracemalloc.Snapshot,
+        previous: Optional[tracemalloc.Snapshot]
+    ) -> str:
+        """Render the top allocation differences between two snapshots."""
+        lines = [f"--- {title} ---"]
+        if previous is not None:
+            stats = current.compare_to(previous, "lineno")
+            lines.extend(str(stat) for stat in stats[:self.top_n])
+        return "\n".join(lines)
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        """Snapshot excluding tracemalloc's and this module's own allocations."""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
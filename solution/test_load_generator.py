@@ -0,0 +1,105 @@
+"""
+Tests for Synthetic Load Generator
+"""
+
+import asyncio
+import unittest
+from load_generator import LoadGenerator
+
+
+class TestLoadGenerator(unittest.TestCase):
+    """Test cases for LoadGenerator."""
+
+    def test_deterministic_for_seed(self):
+        """Test that the same seed yields the same readings."""
+        first = LoadGenerator(num_devices=5, seed=7, jitter=2, dropout=0.1).readings(500)
+        second = LoadGenerator(num_devices=5, seed=7, jitter=2, dropout=0.1).readings(500)
+        other = LoadGenerator(num_devices=5, seed=8, jitter=2, dropout=0.1).readings(500)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_total_and_timestamps(self):
+        """Test reading count and timestamp spacing without dropout or jitter."""
+        readings = LoadGenerator(num_devices=3, seed=1).readings(100)
+
+        self.assertEqual(len(readings), 100)
+        self.assertEqual(readings[0]["timestamp"], 1698000000)
+        self.assertTrue(all(
+            b["timestamp"] - a["timestamp"] == 5
+            for a, b in zip(readings, readings[1:])
+        ))
+        self.assertTrue(all(r["device_id"].startswith("sensor_") for r in readings))
+
+    def test_switch_probability(self):
+        """Test that switch probability controls device changes."""
+        never = LoadGenerator(num_devices=10, switch_probability=0.0, seed=1).readings(1000)
+        self.assertEqual(len({r["device_id"] for r in never}), 1)
+
+        always = LoadGenerator(num_devices=10, switch_probability=1.0, seed=1).readings(1000)
+        self.assertTrue(all(
+            a["device_id"] != b["device_id"] for a, b in zip(always, always[1:])
+        ))
+
+    def test_device_coverage_with_many_devices(self):
+        """Test that long runs keep reaching new devices when num_devices is large."""
+        generator = LoadGenerator(num_devices=100000, switch_probability=0.01, seed=3)
+        seen = set()
+        for chunk in generator.iter_columns(1_000_000):
+            seen.update(chunk["device"])
+
+        # About 10,000 runs over 100,000 devices reach ~9,500 distinct ones.
+        self.assertGreater(len(seen), 9000)
+
+    def test_dropout(self):
+        """Test that dropout removes roughly the requested fraction."""
+        readings = LoadGenerator(num_devices=10, dropout=0.2, seed=1).readings(10000)
+        self.assertGreater(len(readings), 7500)
+        self.assertLess(len(readings), 8500)
+
+    def test_jitter_is_bounded(self):
+        """Test that jitter reorders readings only within its bound."""
+        readings = LoadGenerator(num_devices=10, jitter=3, seed=1).readings(2000)
+        timestamps = [r["timestamp"] for r in readings]
+
+        self.assertNotEqual(timestamps, sorted(timestamps))
+        self.assertEqual(sorted(timestamps), list(range(1698000000, 1698000000 + 2000 * 5, 5)))
+        for position, ts in enumerate(timestamps):
+            self.assertLessEqual(abs((ts - 1698000000) // 5 - position), 3)
+
+    def test_columnar_output(self):
+        """Test that columnar chunks match the dict view."""
+        generator = LoadGenerator(num_devices=4, seed=2, chunk_size=50)
+        chunks = list(generator.iter_columns(120))
+
+        self.assertEqual([len(c["value"]) for c in chunks], [50, 50, 20])
+        flattened = [
+            {"timestamp": ts, "device_id": generator.device_ids[dev], "value": value}
+            for chunk in chunks
+            for ts, dev, value in zip(chunk["timestamp"], chunk["device"], chunk["value"])
+        ]
+        self.assertEqual(flattened, generator.readings(120))
+
+    def test_async_stream(self):
+        """Test that the async stream yields the same readings."""
+        generator = LoadGenerator(num_devices=4, seed=2)
+
+        async def run_test():
+            return [r async for r in generator.async_stream(300)]
+
+        self.assertEqual(asyncio.run(run_test()), generator.readings(300))
+
+    def test_invalid_parameters(self):
+        """Test that invalid parameters are rejected."""
+        with self.assertRaises(ValueError):
+            LoadGenerator(num_devices=0)
+        with self.assertRaises(ValueError):
+            LoadGenerator(switch_probability=1.5)
+        with self.assertRaises(ValueError):
+            LoadGenerator(dropout=1.0)
+        with self.assertRaises(ValueError):
+            LoadGenerator(jitter=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Tests for Stage Profiler
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from unittest.mock import patch
+from io import StringIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'lab1'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'lab2'))
+
+from sensor_aggregator import group_sensor_readings
+from async_sensor_processor import process_sensor_streams_batched
+from stage_profiler import StageProfiler
+
+
+READINGS = [
+    {"timestamp": 1698000000, "device_id": "sensor_1", "value": 23.5},
+    {"timestamp": 1698000005, "device_id": "sensor_1", "value": 23.7},
+    {"timestamp": 1698000010, "device_id": "sensor_2", "value": 45.2},
+    {"timestamp": 1698000015, "device_id": "sensor_1", "value": 28.1},
+]
+
+
+class TestStageProfiler(unittest.TestCase):
+    """Test cases for StageProfiler."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.report_path = os.path.join(self.tmpdir.name, "report.txt")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_grouping_stages_recorded(self):
+        """Test that grouping and group creation are recorded as stages."""
+        with StageProfiler(report_path=self.report_path, use_cprofile=False) as profiler:
+            result = group_sensor_readings(READINGS, profiler=profiler)
+
+        self.assertEqual(result, group_sensor_readings(READINGS))
+        self.assertEqual(profiler.stages["group_sensor_readings"].calls, 1)
+        self.assertEqual(profiler.stages["_create_group"].calls, 3)
+
+    def test_report_written(self):
+        """Test that stop() writes stages, diffs and cProfile output."""
+        with StageProfiler(report_path=self.report_path, snapshot_interval=0.0) as profiler:
+            group_sensor_readings(READINGS, profiler=profiler)
+
+        with open(self.report_path) as f:
+            report = f.read()
+
+        self.assertIn("_create_group", report)
+        self.assertIn("(vs previous)", report)
+        self.assertIn("final (vs baseline)", report)
+        self.assertIn("cProfile", report)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_snapshot_interval(self):
+        """Test that snapshots are throttled by the interval."""
+        with StageProfiler(report_path=self.report_path, snapshot_interval=3600,
+                           use_cprofile=False) as profiler:
+            group_sensor_readings(READINGS, profiler=profiler)
+
+        self.assertEqual(len(profiler.snapshot_diffs), 2)
+
+    def test_retained_allocations_attributed(self):
+        """Test that memory retained inside a stage shows up in its net bytes."""
+        retained = []
+        with StageProfiler(report_path=self.report_path, use_cprofile=False) as profiler:
+            with profiler.stage("leak"):
+                retained.append(bytearray(1024 * 1024))
+            with profiler.stage("transient"):
+                bytearray(1024 * 1024)
+
+        self.assertGreaterEqual(profiler.stages["leak"].net_bytes, 1024 * 1024)
+        self.assertLess(profiler.stages["transient"].net_bytes, 64 * 1024)
+
+    def test_peak_is_per_stage(self):
+        """Test that a stage's peak is not inherited from an earlier stage."""
+        with StageProfiler(report_path=self.report_path, use_cprofile=False) as profiler:
+            with profiler.stage("big"):
+                bytearray(8 * 1024 * 1024)
+            with profiler.stage("small"):
+                bytearray(8)
+
+        self.assertGreaterEqual(profiler.stages["big"].peak_bytes, 8 * 1024 * 1024)
+        self.assertLess(profiler.stages["small"].peak_bytes, 64 * 1024)
+
+    def test_nested_peak_reaches_outer_stage(self):
+        """Test that an inner stage's peak still counts toward the outer stage."""
+        with StageProfiler(report_path=self.report_path, use_cprofile=False) as profiler:
+            with profiler.stage("outer"):
+                bytearray(4 * 1024 * 1024)
+                with profiler.stage("inner"):
+                    bytearray(1024)
+
+        self.assertGreaterEqual(profiler.stages["outer"].peak_bytes, 4 * 1024 * 1024)
+        self.assertLess(profiler.stages["inner"].peak_bytes, 64 * 1024)
+
+    def test_net_blocks_counted(self):
+        """Test that retained objects show up as allocated blocks."""
+        retained = []
+        with StageProfiler(report_path=self.report_path, use_cprofile=False) as profiler:
+            with profiler.stage("retain"):
+                retained.extend([i] for i in range(1000))
+
+        self.assertGreaterEqual(profiler.stages["retain"].net_blocks, 1000)
+        self.assertIn("net blocks", profiler.format_report())
+
+    def test_inactive_profiler_is_noop(self):
+        """Test that stages outside start/stop record nothing."""
+        profiler = StageProfiler(report_path=self.report_path)
+        with profiler.stage("idle"):
+            pass
+
+        self.assertEqual(profiler.stages, {})
+        self.assertEqual(profiler.stop(), "")
+        self.assertFalse(os.path.exists(self.report_path))
+
+    def test_batched_processing_counters(self):
+        """Test that the collector and batcher loop report counters and gauges."""
+        async def run_test():
+            async def small_stream(device_id: str):
+                for i in range(3):
+                    await asyncio.sleep(0.01)
+                    yield {"device_id": device_id, "value": 20.0 + i}
+
+            with patch("sys.stdout", new_callable=StringIO):
+                with StageProfiler(report_path=self.report_path, use_cprofile=False) as profiler:
+                    streams = [small_stream("sensor_1"), small_stream("sensor_2")]
+                    await process_sensor_streams_batched(
+                        streams, batch_size=2, batch_timeout=0.1, profiler=profiler
+                    )
+            return profiler
+
+        profiler = asyncio.run(run_test())
+
+        self.assertEqual(profiler.counters["collector.readings"], 6)
+        self.assertEqual(profiler.counters["batcher.batches"], 3)
+        self.assertEqual(profiler.stages["batcher.flush"].calls, 3)
+        self.assertIn("queue.size", profiler.gauges)
+
+
+if __name__ == "__main__":
+    unittest.main()